@@ -1,19 +1,50 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
+import functools
+import glob
 import json
 import logging
 import os
+import re
+import tempfile
 import zipfile
-from typing import Dict, Any
-from urllib.parse import urlparse, urljoin
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urljoin
 import omegaup.api
+import requests
+import requests.adapters
 import shutil
-import http.client
-import ssl
-
-# Create SSL context that skips certificate verification
-context = ssl._create_unverified_context()
+import urllib3
+
+# Number of problems downloaded concurrently.
+MAX_DOWNLOAD_WORKERS = 8
+
+# Archives are buffered in memory up to this size; larger ones are spooled to
+# a temporary file before extraction.
+MAX_IN_MEMORY_ZIP_SIZE = 64 * 1024 * 1024
+
+# Single keep-alive session shared by every download so that all the
+# problems reuse the same pooled TCP + TLS connections to the host.
+# Certificates are verified unless OMEGAUP_VERIFY=0 is set in the
+# environment. Transient failures and rate limiting are retried with
+# exponential backoff; once the retries are exhausted the last response is
+# returned and reported as usual.
+SESSION = requests.Session()
+SESSION.verify = os.environ.get("OMEGAUP_VERIFY", "1") == "1"
+SESSION.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=2 * MAX_DOWNLOAD_WORKERS,
+    max_retries=urllib3.util.Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(("GET",)),
+        respect_retry_after_header=True,
+        raise_on_status=False)))
+if not SESSION.verify:
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logging.basicConfig(level=logging.INFO)
 LOG = logging.getLogger(__name__)
@@ -27,6 +58,10 @@ COURSE_ALIASES = [
     "Curso-de-Python-FutureLabs"
 ]
 
+# Anything that is not alphanumeric, a space, a dash or an underscore. `\w`
+# matches exactly `str.isalnum()` plus the underscore.
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w -]+")
+
 BASE_COURSE_FOLDER = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "Courses"))
 
@@ -53,8 +88,21 @@ def get_json(endpoint: str, params: Dict[str, str]) -> Dict[str, Any]:
     return API_CLIENT.query(endpoint, params)
 
 
+def read_json(path: str) -> Any:
+    """Reads a JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path: str, data: Any) -> None:
+    """Writes an indented JSON file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(name: str) -> str:
-    return "".join(c for c in name if c.isalnum() or c in " -_").strip()
+    return _UNSAFE_FILENAME_CHARS.sub("", name).strip()
 
 
 def get_course_details(
@@ -70,8 +118,7 @@ def get_course_details(
 
     # Save course_settings.json
     course_settings_path = os.path.join(course_folder, "course_settings.json")
-    with open(course_settings_path, "w", encoding="utf-8") as f:
-        json.dump(details, f, indent=2, ensure_ascii=False)
+    write_json(course_settings_path, details)
 
     return details
 
@@ -88,74 +135,77 @@ def get_assignment_details(course_alias: str, assignment_alias: str):
     })
 
 
-def download_and_unzip(problem_alias: str, assignment_folder: str) -> bool:
+def download_and_unzip(
+        problem_alias: str,
+        problem_folder: str
+) -> bool:
     try:
         download_url = urljoin(
             BASE_URL,
             f"/api/problem/download/problem_alias/{problem_alias}/"
         )
-        parsed_url = urlparse(download_url)
-        conn = http.client.HTTPSConnection(parsed_url.hostname,
-                                           context=context)
-
         headers = {'Authorization': f'token {API_CLIENT.api_token}'}
-        path = parsed_url.path
-
-        conn.request("GET", path, headers=headers)
-        response = conn.getresponse()
-
-        if response.status == 404:
-            response_body = response.read()
-            LOG.warning(
-                f"⚠️  Problem '{problem_alias}' not found or access denied "
-                f"(404). Response body:\n"
-                f"{response_body.decode(errors='ignore')}"
-            )
-            return False
-        elif response.status != 200:
-            response_body = response.read()
-            LOG.error(
-                f"❌ Failed to download '{problem_alias}'. HTTP status: "
-                f"{response.status}"
-            )
-            LOG.error(
-                f"❌ Response body:\n{response_body.decode(errors='ignore')}"
-            )
-            return False
-
-        problem_folder = os.path.join(assignment_folder,
-                                      sanitize_filename(problem_alias))
-        os.makedirs(problem_folder, exist_ok=True)
-
-        zip_path = os.path.join(problem_folder, f"{problem_alias}.zip")
-        with open(zip_path, "wb") as f:
-            while True:
-                chunk = response.read(8192)
-                if not chunk:
-                    break
-                f.write(chunk)
 
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(problem_folder)
-            os.remove(zip_path)
-            LOG.info(f"✅ Extracted: {problem_alias} → {problem_folder}")
-        except zipfile.BadZipFile:
-            LOG.error(f"❌ Failed to unzip: {zip_path}")
-            return False
+        # Problem archives are usually small, so they are kept in memory and
+        # extracted from there instead of round-tripping through disk. Once an
+        # archive grows past MAX_IN_MEMORY_ZIP_SIZE it is rolled over to a
+        # temporary file, which is deleted when it is closed, even if the
+        # download fails halfway.
+        with tempfile.SpooledTemporaryFile(
+                max_size=MAX_IN_MEMORY_ZIP_SIZE) as zip_file:
+            with SESSION.get(download_url, headers=headers, stream=True,
+                             timeout=30) as response:
+                if response.status_code == 404:
+                    LOG.warning(
+                        f"⚠️  Problem '{problem_alias}' not found or access "
+                        f"denied (404). Response body:\n"
+                        f"{response.content.decode(errors='ignore')}"
+                    )
+                    return False
+                elif response.status_code != 200:
+                    LOG.error(
+                        f"❌ Failed to download '{problem_alias}'. HTTP "
+                        f"status: {response.status_code}"
+                    )
+                    LOG.error(
+                        f"❌ Response body:\n"
+                        f"{response.content.decode(errors='ignore')}"
+                    )
+                    return False
+
+                # main() already created the assignment folder.
+                try:
+                    os.mkdir(problem_folder)
+                except FileExistsError:
+                    pass
+
+                for chunk in response.iter_content(chunk_size=65536):
+                    zip_file.write(chunk)
+
+            try:
+                with zipfile.ZipFile(zip_file, "r") as zip_ref:
+                    zip_ref.extractall(problem_folder)
+                LOG.info(f"✅ Extracted: {problem_alias} → {problem_folder}")
+            except zipfile.BadZipFile:
+                LOG.error(f"❌ Failed to unzip: {problem_alias}")
+                return False
 
         settings_path = os.path.join(problem_folder, "settings.json")
         if os.path.exists(settings_path):
             try:
-                with open(settings_path, "r+", encoding="utf-8") as f:
-                    settings = json.load(f)
+                settings = read_json(settings_path)
+                if (settings.get("alias") == problem_alias
+                        and settings.get("title") == problem_alias):
+                    LOG.info(
+                        f"settings.json already up to date for "
+                        f"'{problem_alias}'")
+                else:
                     settings["alias"] = problem_alias
                     settings["title"] = problem_alias
-                    f.seek(0)
-                    json.dump(settings, f, indent=2, ensure_ascii=False)
-                    f.truncate()
-                LOG.info(
-                    f"🛠️  Updated settings.json with alias: {problem_alias}")
+                    write_json(settings_path, settings)
+                    LOG.info(
+                        f"🛠️  Updated settings.json with alias: "
+                        f"{problem_alias}")
             except Exception as e:
                 LOG.warning(
                     f"⚠️  Failed to update settings.json for "
@@ -176,25 +226,64 @@ def main():
     api_token = handle_input()
     API_CLIENT = omegaup.api.Client(api_token=api_token, url=BASE_URL)
 
+    # Folders left behind by a previous run that was interrupted before it
+    # could delete them are removed as well.
+    stale_folders = glob.glob(f"{glob.escape(BASE_COURSE_FOLDER)}.old.*")
     if os.path.exists(BASE_COURSE_FOLDER):
         LOG.warning("Delete existing course folder to avoid conflicts")
-        shutil.rmtree(BASE_COURSE_FOLDER)
+        # Move the old folder out of the way and delete it in the background
+        # while the downloads run.
+        stale_folder = f"{BASE_COURSE_FOLDER}.old.{os.getpid()}"
+        os.rename(BASE_COURSE_FOLDER, stale_folder)
+        stale_folders.append(stale_folder)
+    cleanup_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    cleanup_futures = [
+        (stale_folder, cleanup_executor.submit(shutil.rmtree, stale_folder))
+        for stale_folder in stale_folders
+    ]
+    cleanup_executor.shutdown(wait=False)
 
     os.makedirs(BASE_COURSE_FOLDER, exist_ok=True)
     all_problems = []
 
-    for course_alias in COURSE_ALIASES:
-        LOG.info(f"📘 Starting course: {course_alias}")
-        try:
-            assignments = get_assignments(course_alias)
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+        # None of the metadata requests depend on each other, so they are all
+        # issued up front instead of one round-trip at a time.
+        assignments_futures = [
+            (course_alias, executor.submit(get_assignments, course_alias))
+            for course_alias in COURSE_ALIASES
+        ]
+        details_futures: List[Tuple[
+            str, List[Tuple[Dict[str, Any], concurrent.futures.Future[Any]]]
+        ]] = []
+        for course_alias, assignments_future in assignments_futures:
+            LOG.info(f"📘 Starting course: {course_alias}")
+            try:
+                assignments = assignments_future.result()
+            except Exception as e:
+                LOG.error(f"❌ Failed to process course '{course_alias}': {e}")
+                continue
 
             if not assignments:
                 LOG.warning(f"No assignments found in {course_alias}.")
                 continue
 
+            details_futures.append((course_alias, [
+                (assignment,
+                 executor.submit(get_assignment_details, course_alias,
+                                 assignment["alias"]))
+                for assignment in assignments
+            ]))
+
+        # Downloads are queued in course/assignment order and collected in
+        # that same order, so problems.json stays deterministic.
+        futures: List[Tuple[str, str, concurrent.futures.Future[bool]]] = []
+
+        for course_alias, assignment_details in details_futures:
             course_folder = os.path.join(BASE_COURSE_FOLDER, course_alias)
 
-            for assignment in assignments:
+            for assignment, details_future in assignment_details:
                 assignment_alias = assignment["alias"]
                 assignment_name = assignment["name"]
                 LOG.info(
@@ -203,36 +292,25 @@ def main():
                 )
 
                 try:
-                    details = get_assignment_details(course_alias,
-                                                     assignment_alias)
+                    details = details_future.result()
                     assignment_folder = os.path.join(course_folder,
                                                      assignment_alias)
                     os.makedirs(assignment_folder, exist_ok=True)
 
-                    problems = details.get("problems", [])
-
-                    for problem in problems:
-                        try:
-                            downloaded = download_and_unzip(problem["alias"],
-                                                            assignment_folder)
-                            if downloaded:
-                                rel_path = os.path.join(
-                                    "Courses",
-                                    course_alias,
-                                    assignment_alias,
-                                    sanitize_filename(problem["alias"])
-                                )
-                                LOG.info(f"📂 Added problem path: {rel_path}")
-                                all_problems.append({"path": rel_path})
-                            else:
-                                LOG.warning(
-                                    f"⚠️  Skipped adding '{problem['alias']}' "
-                                    f"due to download failure.")
-                        except Exception as e:
-                            LOG.error(
-                                f"❌ Error while processing problem "
-                                f"'{problem['alias']}': {e}"
-                            )
+                    for problem in details.get("problems", []):
+                        problem_dirname = sanitize_filename(problem["alias"])
+                        rel_path = os.path.join("Courses",
+                                                course_alias,
+                                                assignment_alias,
+                                                problem_dirname)
+                        futures.append((
+                            problem["alias"],
+                            rel_path,
+                            executor.submit(download_and_unzip,
+                                            problem["alias"],
+                                            os.path.join(assignment_folder,
+                                                         problem_dirname)),
+                        ))
 
                 except Exception as e:
                     LOG.error(
@@ -240,17 +318,35 @@ def main():
                         f"'{assignment_alias}': {e}"
                     )
 
-        except Exception as e:
-            LOG.error(f"❌ Failed to process course '{course_alias}': {e}")
+        for problem_alias, rel_path, future in futures:
+            try:
+                if future.result():
+                    LOG.info(f"📂 Added problem path: {rel_path}")
+                    all_problems.append({"path": rel_path})
+                else:
+                    LOG.warning(
+                        f"⚠️  Skipped adding '{problem_alias}' "
+                        f"due to download failure.")
+            except Exception as e:
+                LOG.error(
+                    f"❌ Error while processing problem "
+                    f"'{problem_alias}': {e}"
+                )
 
     # ✅ Write problems.json
     problems_json_path = os.path.abspath(
         os.path.join(os.path.dirname(__file__), "..", "problems.json"))
-    with open(problems_json_path, "w", encoding="utf-8") as f:
-        LOG.info(f"Writing problems.json to {problems_json_path}")
-        json.dump({"problems": all_problems}, f, indent=2, ensure_ascii=False)
+    LOG.info(f"Writing problems.json to {problems_json_path}")
+    write_json(problems_json_path, {"problems": all_problems})
     LOG.info("📝 Created problems.json with all problem paths.")
 
+    for stale_folder, cleanup_future in cleanup_futures:
+        try:
+            cleanup_future.result()
+        except Exception as e:
+            LOG.error(f"❌ Failed to delete '{stale_folder}': {e}")
+            raise
+
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,13 @@
+import concurrent.futures
+import functools
 import logging
 import os
 import sys
 import subprocess
 import json
 
-from typing import Any, List, Mapping, NamedTuple, NoReturn, Optional, Sequence
+from typing import (Any, List, Mapping, NamedTuple, NoReturn, Optional,
+                    Sequence, Set)
 
 
 SETTINGS_JSON = 'settings.json'
@@ -13,6 +16,8 @@ OUT_PATTERN = '**/*.out'
 PROBLEMS_JSON = 'problems.json'
 DEFAULT_COMMIT_RANGE = 'origin/main...HEAD'
 
+_LOAD_WORKERS = 16
+
 
 class Problem(NamedTuple):
     """Represents a single problem."""
@@ -22,23 +27,12 @@ class Problem(NamedTuple):
 
     @staticmethod
     def load(problemPath: str, rootDirectory: str) -> 'Problem':
-        """Load a single problem from the path."""
-        settings_path = os.path.join(rootDirectory, problemPath, SETTINGS_JSON)
-        try:
-            with open(settings_path) as f:
-                problemConfig = json.load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(
-                f"{SETTINGS_JSON} not found at: {settings_path}")
-        except json.JSONDecodeError as e:
-            raise ValueError(
-                f"Invalid JSON format in {SETTINGS_JSON} at: {settings_path}. "
-                f"Error: {e}"
-            )
-
-        return Problem(path=problemPath,
-                       title=problemConfig['title'],
-                       config=problemConfig)
+        """Load a single problem from the path.
+
+        Results are cached, so each settings.json is parsed at most once per
+        process.
+        """
+        return _loadProblem(problemPath, rootDirectory)
 
     def shouldGenerateOutputs(self, *, rootDirectory: str) -> bool:
         """Returns whether the .out files should be generated for this problem.
@@ -46,21 +40,47 @@ class Problem(NamedTuple):
         .out files are only generated if there is a .gitignore file that
         contains the line `**/*.out` in the problem directory.
         """
-        gitignorePath = os.path.join(rootDirectory, self.path, GITIGNORE)
-        if not os.path.isfile(gitignorePath):
-            return False
-        with open(gitignorePath, 'r') as f:
-            for line in f:
-                if line.strip() == OUT_PATTERN:
-                    return True
+        return _gitignoreHasOutPattern(
+            os.path.join(rootDirectory, self.path, GITIGNORE))
+
+
+@functools.lru_cache(maxsize=None)
+def _loadProblem(problemPath: str, rootDirectory: str) -> Problem:
+    """Load a single problem from the path."""
+    settings_path = os.path.join(rootDirectory, problemPath, SETTINGS_JSON)
+    try:
+        with open(settings_path) as f:
+            problemConfig = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"{SETTINGS_JSON} not found at: {settings_path}")
+    except json.JSONDecodeError as e:
+        raise ValueError(
+            f"Invalid JSON format in {SETTINGS_JSON} at: {settings_path}. "
+            f"Error: {e}"
+        )
+
+    return Problem(path=problemPath,
+                   title=problemConfig['title'],
+                   config=problemConfig)
+
+
+@functools.lru_cache(maxsize=None)
+def _gitignoreHasOutPattern(gitignorePath: str) -> bool:
+    """Returns whether the .gitignore file contains `**/*.out`."""
+    if not os.path.isfile(gitignorePath):
         return False
+    with open(gitignorePath, 'r') as f:
+        return OUT_PATTERN in {line.strip() for line in f.read().splitlines()}
 
 
+@functools.lru_cache(maxsize=None)
 def repositoryRoot() -> str:
     """Returns the root directory of the project.
 
     If this is a submodule, it gets the root of the top-level working tree.
-    Raises RuntimeError if it fails to determine the root.
+    Raises RuntimeError if it fails to determine the root. The result is
+    cached, so git is only invoked once per process.
     """
     try:
         output = subprocess.check_output([
@@ -126,6 +146,21 @@ def fatal(message: str,
     sys.exit(1)
 
 
+def _loadProblems(problemPaths: Sequence[str], *,
+                  rootDirectory: str) -> List[Problem]:
+    """Loads the problems in `problemPaths`, preserving their order.
+
+    The settings.json files are independent of each other, so they are read
+    concurrently.
+    """
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=_LOAD_WORKERS) as executor:
+        return list(
+            executor.map(
+                functools.partial(Problem.load, rootDirectory=rootDirectory),
+                problemPaths))
+
+
 def problems(allProblems: bool = False,
              problemPaths: Sequence[str] = (),
              rootDirectory: Optional[str] = None) -> List[Problem]:
@@ -145,22 +180,20 @@ def problems(allProblems: bool = False,
         # Generate the Problem objects from just the path. The title is ignored
         # anyways, since it's read from the configuration file in the problem
         # directory for anything important.
-        return [
-            Problem.load(problemPath=problemPath, rootDirectory=rootDirectory)
-            for problemPath in problemPaths
-        ]
+        return _loadProblems(problemPaths, rootDirectory=rootDirectory)
 
     with open(os.path.join(rootDirectory, PROBLEMS_JSON), 'r') as p:
         config = json.load(p)
 
-    configProblems: List[Problem] = []
+    configProblemPaths: List[str] = []
     for problem in config['problems']:
         if problem.get('disabled', False):
             logging.warning('Problem %s disabled. Skipping.', problem['title'])
             continue
-        configProblems.append(
-            Problem.load(problemPath=problem['path'],
-                         rootDirectory=rootDirectory))
+        configProblemPaths.append(problem['path'])
+
+    configProblems = _loadProblems(configProblemPaths,
+                                   rootDirectory=rootDirectory)
 
     if allProblems:
         logging.info('Loading everything as requested.')
@@ -177,16 +210,33 @@ def problems(allProblems: bool = False,
     else:
         commitRange = DEFAULT_COMMIT_RANGE
 
+    if not configProblems:
+        return []
+
+    # Limit the diff to the problem directories so that git does the
+    # filtering, and use NUL-separated output so paths are never quoted.
     changes = subprocess.check_output(
-        ['git', 'diff', '--name-only', '--diff-filter=AMDR', commitRange],
-        cwd=rootDirectory,
-        universal_newlines=True)
+        [
+            'git', 'diff', '--name-only', '--diff-filter=AMDR', '-z',
+            commitRange, '--'
+        ] + [problem.path for problem in configProblems],
+        cwd=rootDirectory)
+
+    # Every directory that contains a changed file, so that each problem can
+    # be matched with a single set lookup.
+    changedDirectories: Set[str] = set()
+    for changedPath in os.fsdecode(changes).split('\0'):
+        if not changedPath:
+            continue
+        components = changedPath.split('/')
+        for i in range(1, len(components) + 1):
+            changedDirectories.add('/'.join(components[:i]))
 
     problems: List[Problem] = []
     for problem in configProblems:
         logging.info('Loading %s.', problem.title)
 
-        if problem.path not in changes:
+        if problem.path.rstrip('/') not in changedDirectories:
             logging.info('No changes to %s. Skipping.', problem.title)
             continue
         problems.append(problem)
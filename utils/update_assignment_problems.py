@@ -1,20 +1,34 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
+import functools
+import io
 import json
 import logging
 import os
 import datetime
-from typing import Dict, Any, List, NamedTuple, Tuple
+import threading
+from typing import Dict, Any, List, Set, Tuple
 import omegaup.api
 import re
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
+import requests
+import requests.adapters
 import shutil
-import http.client
-import ssl
+import urllib3
 import zipfile
 
-context = ssl._create_unverified_context()
+# Single keep-alive session shared by every download so that all the
+# problems reuse the same pooled TCP + TLS connections to the host.
+# Certificates are verified unless OMEGAUP_VERIFY=0 is set in the
+# environment; the pooled connections reuse the same SSL context.
+SESSION = requests.Session()
+SESSION.verify = os.environ.get("OMEGAUP_VERIFY", "1") == "1"
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4,
+                                                        pool_maxsize=16))
+if not SESSION.verify:
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logging.basicConfig(level=logging.INFO)
 LOG = logging.getLogger(__name__)
@@ -25,18 +39,33 @@ COURSE_ALIASES = [
     "omi-public-course"
 ]
 
+# Number of add/remove requests processed concurrently.
+MAX_WORKERS = 8
+
 DOWNLOAD_BASE_FOLDER = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "Courses"))
 PROBLEMS_JSON_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "problems.json"))
 
+# Any character that may not appear in a folder name.
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^a-zA-Z0-9_\-\.]')
+
 
-class ProblemEntry(NamedTuple):
-    path: str
+# Buffer used to copy each archive member to disk. Statements and cases can
+# be several MB, so this is much larger than the zipfile default.
+_COPY_BUFFER_SIZE = 1 << 20
 
 
+@functools.lru_cache(maxsize=1024)
 def sanitize_filename(name: str) -> str:
-    return re.sub(r'[^a-zA-Z0-9_\-\.]', '_', name)
+    return _UNSAFE_FILENAME_CHARS.sub('_', name)
+
+
+@functools.lru_cache(maxsize=None)
+def assignment_folder_path(course: str, assignment: str) -> str:
+    """Returns the local folder of an assignment."""
+    return os.path.join(DOWNLOAD_BASE_FOLDER, sanitize_filename(course),
+                        sanitize_filename(assignment))
 
 
 def handle_input() -> Tuple[str, str, str]:
@@ -67,15 +96,27 @@ def handle_input() -> Tuple[str, str, str]:
     return args.api_token, args.url, args.input
 
 
-def assignment_exists(assignments: List[Any], alias: str) -> bool:
-    return any(a.alias == alias for a in assignments)
+def get_assignment_aliases(
+        client: omegaup.api.Client,
+        course_alias: str,
+        assignments_cache: Dict[str, Set[str]]
+) -> Set[str]:
+    """Returns the assignment aliases of a course, fetching them only once."""
+    if course_alias not in assignments_cache:
+        assignments_response = client.course.listAssignments(
+            course_alias=course_alias,
+        )
+        assignments_cache[course_alias] = {
+            a.alias for a in assignments_response.assignments
+        }
+    return assignments_cache[course_alias]
 
 
 def create_assignment(
         client: omegaup.api.Client,
         course_alias: str,
         assignment_alias: str
-) -> None:
+) -> bool:
     now = datetime.datetime.now(datetime.timezone.utc)
     finish = now + datetime.timedelta(days=30)
 
@@ -96,8 +137,29 @@ def create_assignment(
             unlimited_duration=True
         )
         LOG.info(f"✅ Created assignment '{assignment_alias}'")
+        return True
     except Exception as e:
         LOG.error(f"❌ Failed to create assignment '{assignment_alias}': {e}")
+        return False
+
+
+def extract_zip(zip_ref: zipfile.ZipFile, problem_folder: str) -> None:
+    """Extracts every member of the archive into `problem_folder`.
+
+    Members whose path would end up outside of `problem_folder` are skipped.
+    """
+    root = os.path.abspath(problem_folder)
+    for info in zip_ref.infolist():
+        target = os.path.abspath(os.path.join(root, info.filename))
+        if os.path.commonpath([root, target]) != root:
+            LOG.warning(f"⚠️  Skipping unsafe archive entry: {info.filename}")
+            continue
+        if info.is_dir():
+            os.makedirs(target, exist_ok=True)
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with zip_ref.open(info) as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, _COPY_BUFFER_SIZE)
 
 
 def download_and_unzip(
@@ -111,54 +173,44 @@ def download_and_unzip(
             base_url,
             f"/api/problem/download/problem_alias/{problem_alias}/"
         )
-        parsed_url = urlparse(download_url)
-        conn = http.client.HTTPSConnection(parsed_url.hostname,
-                                           context=context)
-
         headers = {'Authorization': f'token {api_token}'}
-        path = parsed_url.path
 
-        conn.request("GET", path, headers=headers)
-        response = conn.getresponse()
-
-        if response.status == 404:
-            response_body = response.read()
-            LOG.warning(
-                f"⚠️  Problem '{problem_alias}' not found or access denied "
-                f"(404). Response body:\n"
-                f"{response_body.decode(errors='ignore')}"
-            )
-            return False
-        elif response.status != 200:
-            response_body = response.read()
-            LOG.error(
-                f"❌ Failed to download '{problem_alias}'. HTTP status: "
-                f"{response.status}"
-            )
-            LOG.error(
-                f"❌ Response body:\n{response_body.decode(errors='ignore')}"
-            )
-            return False
+        with SESSION.get(download_url, headers=headers, stream=True,
+                         timeout=30) as response:
+            if response.status_code == 404:
+                LOG.warning(
+                    f"⚠️  Problem '{problem_alias}' not found or access "
+                    f"denied (404). Response body:\n"
+                    f"{response.content.decode(errors='ignore')}"
+                )
+                return False
+            elif response.status_code != 200:
+                LOG.error(
+                    f"❌ Failed to download '{problem_alias}'. HTTP status: "
+                    f"{response.status_code}"
+                )
+                LOG.error(
+                    f"❌ Response body:\n"
+                    f"{response.content.decode(errors='ignore')}"
+                )
+                return False
 
-        problem_folder = os.path.join(assignment_folder,
-                                      sanitize_filename(problem_alias))
-        os.makedirs(problem_folder, exist_ok=True)
+            problem_folder = os.path.join(assignment_folder,
+                                          sanitize_filename(problem_alias))
+            os.makedirs(problem_folder, exist_ok=True)
 
-        zip_path = os.path.join(problem_folder, f"{problem_alias}.zip")
-        with open(zip_path, "wb") as f:
-            while True:
-                chunk = response.read(8192)
-                if not chunk:
-                    break
-                f.write(chunk)
+            # Problem archives are small, so they are kept in memory and
+            # extracted from there instead of round-tripping through disk.
+            zip_buffer = io.BytesIO()
+            for chunk in response.iter_content(chunk_size=65536):
+                zip_buffer.write(chunk)
 
         try:
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(problem_folder)
-            os.remove(zip_path)
+            with zipfile.ZipFile(zip_buffer, "r") as zip_ref:
+                extract_zip(zip_ref, problem_folder)
             LOG.info(f"✅ Extracted: {problem_alias} → {problem_folder}")
         except zipfile.BadZipFile as e:
-            LOG.error(f"❌ Failed to unzip: {zip_path}: {e}")
+            LOG.error(f"❌ Failed to unzip: {problem_alias}: {e}")
             return False
 
         settings_path = os.path.join(problem_folder, "settings.json")
@@ -166,6 +218,12 @@ def download_and_unzip(
             try:
                 with open(settings_path, "r+", encoding="utf-8") as f:
                     settings = json.load(f)
+                    if (settings.get("alias") == problem_alias
+                            and settings.get("title") == problem_alias):
+                        LOG.info(
+                            f"settings.json already up to date for "
+                            f"'{problem_alias}'")
+                        return True
                     settings["alias"] = problem_alias
                     settings["title"] = problem_alias
                     f.seek(0)
@@ -189,185 +247,336 @@ def download_and_unzip(
         return False
 
 
+def add_problem(
+        item: Dict[str, Any],
+        client: omegaup.api.Client,
+        base_url: str,
+        assignments_cache: Dict[str, Set[str]],
+        assignments_lock: threading.Lock
+) -> bool:
+    """Adds a single problem to its assignment and downloads it.
+
+    Returns whether the problem should be added to problems.json.
+    """
+    course = item["course_alias"]
+    assignment = item["assignment_alias"]
+    problem = item["problem_alias"]
+    points = item["points"]
+
+    if course not in COURSE_ALIASES:
+        LOG.error(f"❌ Course '{course}' not allowed.")
+        return False
+
+    LOG.info(
+        f"➕ Adding problem '{problem}' to assignment '{assignment}' in "
+        f"course '{course}'"
+    )
+
+    try:
+        # Several items may target the same missing assignment, so the
+        # check-then-create sequence must not interleave.
+        with assignments_lock:
+            assignments = get_assignment_aliases(client, course,
+                                                 assignments_cache)
+            if assignment not in assignments:
+                LOG.warning(
+                    f"📂 Assignment '{assignment}' not found in course "
+                    f"'{course}', creating it..."
+                )
+                if create_assignment(client, course, assignment):
+                    assignments.add(assignment)
+
+        client.course.addProblem(
+            course_alias=course,
+            assignment_alias=assignment,
+            problem_alias=problem,
+            points=points
+        )
+        LOG.info(
+            f"✅ Added problem '{problem}' to assignment '{assignment}'"
+        )
+
+        assignment_folder = assignment_folder_path(course, assignment)
+        os.makedirs(assignment_folder, exist_ok=True)
+
+        # The problem was already downloaded by a previous run (or by the
+        # course sync), so there is nothing to fetch.
+        problem_folder = os.path.join(assignment_folder,
+                                      sanitize_filename(problem))
+        if os.path.isfile(os.path.join(problem_folder, "settings.json")):
+            LOG.info(
+                f"📦 Problem '{problem}' already present at "
+                f"{problem_folder}, skipping download")
+            return True
+
+        LOG.info(f"📥 Downloading and unzipping problem '{problem}'")
+        success = download_and_unzip(
+            problem_alias=problem,
+            assignment_folder=assignment_folder,
+            base_url=base_url,
+            api_token=client.api_token
+        )
+
+        if not success:
+            LOG.warning(
+                f"⚠️  Skipping problems.json update due to failed download"
+                f" for '{problem}'")
+        return success
+
+    except Exception as e:
+        LOG.error(f"❌ Failed to add problem '{problem}': {e}")
+        return False
+
+
 def process_add(
         data: Dict[str, Any],
-        problems_data: Dict[str, List[Dict[str, str]]],
+        problems_data: Dict[str, List[Dict[str, Any]]],
+        problem_paths: Set[str],
         client: omegaup.api.Client,
         base_url: str
-):
-    for item in data.get("add_problem", []):
+) -> bool:
+    """Processes the additions. Returns whether problems.json changed."""
+    items = drop_duplicate_items(data.get("add_problem", []))
+    assignments_cache: Dict[str, Set[str]] = {}
+    assignments_lock = threading.Lock()
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(
+            functools.partial(add_problem,
+                              client=client,
+                              base_url=base_url,
+                              assignments_cache=assignments_cache,
+                              assignments_lock=assignments_lock),
+            items))
+
+    # problems.json is updated in input order, regardless of which
+    # download finished first.
+    changed = False
+    for item, added in zip(items, results):
+        if not added:
+            continue
         course = item["course_alias"]
         assignment = item["assignment_alias"]
         problem = item["problem_alias"]
-        points = item["points"]
-
-        if course not in COURSE_ALIASES:
-            LOG.error(f"❌ Course '{course}' not allowed.")
-            continue
-
+        if add_problem_to_json(course, assignment, problem, problems_data,
+                               problem_paths):
+            changed = True
         LOG.info(
-            f"➕ Adding problem '{problem}' to assignment '{assignment}' in "
-            f"course '{course}'"
+            f"📘 problems.json updated with: Courses"
+            f"/{course}/{assignment}/{problem}"
         )
+    return changed
 
-        try:
-            assignments_response = client.course.listAssignments(
-                course_alias=course,
-            )
-            assignments = assignments_response.assignments
-            if not assignment_exists(assignments, assignment):
-                LOG.warning(
-                    f"📂 Assignment '{assignment}' not found in course "
-                    f"'{course}', creating it..."
-                )
-                create_assignment(client, course, assignment)
 
-            client.course.addProblem(
-                course_alias=course,
-                assignment_alias=assignment,
-                problem_alias=problem,
-                points=points
-            )
-            LOG.info(
-                f"✅ Added problem '{problem}' to assignment '{assignment}'"
-            )
+def remove_problem(
+        item: Dict[str, Any],
+        client: omegaup.api.Client,
+        assignments_cache: Dict[str, Set[str]],
+        assignments_lock: threading.Lock
+) -> bool:
+    """Removes a single problem from its assignment and deletes its folder.
+
+    Returns whether the problem should be removed from problems.json.
+    """
+    course = item["course_alias"]
+    assignment = item["assignment_alias"]
+    problem = item["problem_alias"]
+
+    if course not in COURSE_ALIASES:
+        LOG.error(f"❌ Course '{course}' not allowed.")
+        return False
+
+    LOG.info(
+        f"➖ Removing problem '{problem}' from assignment '{assignment}' "
+        f"in course '{course}'"
+    )
 
-            assignment_folder = os.path.join(DOWNLOAD_BASE_FOLDER,
-                                             sanitize_filename(course),
-                                             sanitize_filename(assignment))
-            os.makedirs(assignment_folder, exist_ok=True)
-
-            LOG.info(f"📥 Downloading and unzipping problem '{problem}'")
-            success = download_and_unzip(
-                problem_alias=problem,
-                assignment_folder=assignment_folder,
-                base_url=base_url,
-                api_token=client.api_token
+    try:
+        with assignments_lock:
+            assignments = get_assignment_aliases(client, course,
+                                                 assignments_cache)
+        if assignment not in assignments:
+            LOG.warning(
+                f"⚠️ Assignment '{assignment}' not found in course "
+                f"'{course}', skipping removal."
             )
+            return False
+
+        client.course.removeProblem(
+            course_alias=course,
+            assignment_alias=assignment,
+            problem_alias=problem
+        )
+        LOG.info(
+            f"✅ Removed problem '{problem}' from assignment "
+            f"'{assignment}'"
+        )
 
-            if success:
-                add_problem_to_json(course, assignment, problem, problems_data)
+        problem_folder = os.path.join(
+            assignment_folder_path(course, assignment),
+            sanitize_filename(problem)
+        )
+        if os.path.exists(problem_folder):
+            try:
+                shutil.rmtree(problem_folder)
                 LOG.info(
-                    f"📘 problems.json updated with: Courses"
-                    f"/{course}/{assignment}/{problem}"
+                    f"🗑️  Deleted folder for problem '{problem}' at "
+                    f"{problem_folder}"
                 )
-            else:
+            except OSError as e:
                 LOG.warning(
-                    f"⚠️  Skipping problems.json update due to failed download"
-                    f" for '{problem}'")
+                    f"⚠️  Failed to delete folder '{problem_folder}': {e}")
+        else:
+            LOG.warning(
+                f"⚠️  Folder '{problem_folder}' not found, skipping"
+                f" deletion.")
 
-        except Exception as e:
-            LOG.error(f"❌ Failed to add problem '{problem}': {e}")
+        return True
+
+    except Exception as e:
+        LOG.error(f"❌ Failed to remove problem '{problem}': {e}")
+        return False
 
 
 def process_remove(
        data: Dict[str, Any],
-       problems_data: Dict[str, List[Dict[str, str]]],
+       problems_data: Dict[str, List[Dict[str, Any]]],
+       problem_paths: Set[str],
        client: omegaup.api.Client
-):
-    for item in data.get("remove_problem", []):
+) -> bool:
+    """Processes the removals. Returns whether problems.json changed."""
+    items = drop_duplicate_items(data.get("remove_problem", []))
+    assignments_cache: Dict[str, Set[str]] = {}
+    assignments_lock = threading.Lock()
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(
+            functools.partial(remove_problem,
+                              client=client,
+                              assignments_cache=assignments_cache,
+                              assignments_lock=assignments_lock),
+            items))
+
+    changed = False
+    for item, removed in zip(items, results):
+        if not removed:
+            continue
         course = item["course_alias"]
         assignment = item["assignment_alias"]
         problem = item["problem_alias"]
-
-        if course not in COURSE_ALIASES:
-            LOG.error(f"❌ Course '{course}' not allowed.")
-            continue
-
+        if remove_problem_from_json(course, assignment, problem,
+                                    problems_data, problem_paths):
+            changed = True
         LOG.info(
-            f"➖ Removing problem '{problem}' from assignment '{assignment}' "
-            f"in course '{course}'"
+            f"📘 problems.json entry removed: "
+            f"Courses/{course}/{assignment}/{problem}"
         )
+    return changed
 
-        try:
-            assignments_response = client.course.listAssignments(
-                course_alias=course,
-            )
-            assignments = assignments_response.assignments
-            if not assignment_exists(assignments, assignment):
-                LOG.warning(
-                    f"⚠️ Assignment '{assignment}' not found in course "
-                    f"'{course}', skipping removal."
-                )
-                continue
 
-            client.course.removeProblem(
-                course_alias=course,
-                assignment_alias=assignment,
-                problem_alias=problem
-            )
-            LOG.info(
-                f"✅ Removed problem '{problem}' from assignment "
-                f"'{assignment}'"
-            )
+def problem_key(item: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (item["course_alias"], item["assignment_alias"],
+            item["problem_alias"])
 
-            problem_folder = os.path.join(
-                DOWNLOAD_BASE_FOLDER,
-                sanitize_filename(course),
-                sanitize_filename(assignment),
-                sanitize_filename(problem)
-            )
-            if os.path.exists(problem_folder):
-                try:
-                    shutil.rmtree(problem_folder)
-                    LOG.info(
-                        f"🗑️  Deleted folder for problem '{problem}' at "
-                        f"{problem_folder}"
-                    )
-                except OSError as e:
-                    LOG.warning(
-                        f"⚠️  Failed to delete folder '{problem_folder}': {e}")
-            else:
-                LOG.warning(
-                    f"⚠️  Folder '{problem_folder}' not found, skipping"
-                    f" deletion.")
 
-            remove_problem_from_json(course, assignment, problem,
-                                     problems_data)
-            LOG.info(
-                f"📘 problems.json entry removed: "
-                f"Courses/{course}/{assignment}/{problem}"
+def drop_duplicate_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keeps only the first item for each course/assignment/problem.
+
+    Items are processed concurrently, so duplicates would otherwise race on
+    the same API calls and problem folder.
+    """
+    seen: Set[Tuple[str, str, str]] = set()
+    unique_items = []
+    for item in items:
+        key = problem_key(item)
+        if key in seen:
+            course, assignment, problem = key
+            LOG.warning(
+                f"⚠️  Problem '{problem}' is listed more than once for "
+                f"'{assignment}' in course '{course}', ignoring duplicates."
             )
+            continue
+        seen.add(key)
+        unique_items.append(item)
+    return unique_items
+
+
+def cancel_opposing_changes(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Drops problems that are both added to and removed from an assignment.
+
+    Such pairs cancel each other out, so neither the download nor the
+    deletion is worth doing.
+    """
+    add_items = data.get("add_problem", [])
+    remove_items = data.get("remove_problem", [])
+    cancelled = ({problem_key(item) for item in add_items}
+                 & {problem_key(item) for item in remove_items})
+    for course, assignment, problem in sorted(cancelled):
+        LOG.warning(
+            f"⚠️  Problem '{problem}' is both added to and removed from "
+            f"'{assignment}' in course '{course}', ignoring both."
+        )
 
-        except Exception as e:
-            LOG.error(f"❌ Failed to remove problem '{problem}': {e}")
+    return {
+        **data,
+        "add_problem": [
+            item for item in add_items if problem_key(item) not in cancelled
+        ],
+        "remove_problem": [
+            item for item in remove_items if problem_key(item) not in cancelled
+        ],
+    }
 
 
-def load_problems_json() -> Dict[str, List[ProblemEntry]]:
+def load_problems_json() -> Tuple[Dict[str, List[Dict[str, Any]]], Set[str]]:
+    """Loads problems.json along with the set of paths it contains."""
     if os.path.exists(PROBLEMS_JSON_PATH):
         with open(PROBLEMS_JSON_PATH, "r", encoding="utf-8") as f:
             data = json.load(f)
-            return {"problems": [ProblemEntry(**p) for p in data.get(
-                "problems", [])]}
-    return {"problems": []}
+            entries = data.get("problems", [])
+            return {"problems": entries}, {p["path"] for p in entries}
+    return {"problems": []}, set()
 
 
-def save_problems_json(data: Dict[str, List[ProblemEntry]]):
-    with open(PROBLEMS_JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(
-            {"problems": [p._asdict() for p in data["problems"]]},
-            f,
-            indent=2,
-            ensure_ascii=False)
+def save_problems_json(data: Dict[str, List[Dict[str, Any]]]):
+    """Writes problems.json atomically, so it is never left half-written."""
+    contents = json.dumps(
+        {"problems": data["problems"]},
+        indent=2,
+        ensure_ascii=False)
+    temp_path = f"{PROBLEMS_JSON_PATH}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(contents)
+    os.replace(temp_path, PROBLEMS_JSON_PATH)
 
 
 def add_problem_to_json(course: str, assignment: str, problem: str,
-                        problems_data: Dict[str, List[ProblemEntry]]):
+                        problems_data: Dict[str, List[Dict[str, Any]]],
+                        problem_paths: Set[str]) -> bool:
+    """Adds the problem to problems.json. Returns whether it was missing."""
     path = f"Courses/{course}/{assignment}/{problem}"
-    if not any(p.path == path for p in problems_data["problems"]):
-        problems_data["problems"].append(ProblemEntry(path=path))
-        LOG.info(f"📝 Added '{path}' to problems.json")
+    if path in problem_paths:
+        return False
+    problem_paths.add(path)
+    problems_data["problems"].append({"path": path})
+    LOG.info(f"📝 Added '{path}' to problems.json")
+    return True
 
 
 def remove_problem_from_json(course: str, assignment: str, problem: str,
-                             problems_data: Dict[str, List[ProblemEntry]]):
+                             problems_data: Dict[str, List[Dict[str, Any]]],
+                             problem_paths: Set[str]) -> bool:
+    """Removes the problem from problems.json. Returns whether it was there."""
     path = f"Courses/{course}/{assignment}/{problem}"
-    before = len(problems_data["problems"])
+    if path not in problem_paths:
+        return False
+    problem_paths.remove(path)
     problems_data["problems"] = [
-        p for p in problems_data["problems"] if p.path != path]
-    after = len(problems_data["problems"])
-    if before != after:
-        LOG.info(f"🗑️  Removed '{path}' from problems.json")
+        p for p in problems_data["problems"] if p["path"] != path]
+    LOG.info(f"🗑️  Removed '{path}' from problems.json")
+    return True
 
 
 def main():
@@ -381,10 +590,18 @@ def main():
     with open(input_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    problems_data = load_problems_json()
-    process_add(data, problems_data, client, base_url)
-    process_remove(data, problems_data, client)
-    save_problems_json(problems_data)
+    data = cancel_opposing_changes(data)
+
+    # Removals go first, so that problems.json is cleaned up before any new
+    # entries are appended to it.
+    problems_data, problem_paths = load_problems_json()
+    removed = process_remove(data, problems_data, problem_paths, client)
+    added = process_add(data, problems_data, problem_paths, client,
+                        base_url)
+    if added or removed:
+        save_problems_json(problems_data)
+    else:
+        LOG.info("problems.json is unchanged, not rewriting it")
 
     try:
         with open(input_path, "w", encoding="utf-8") as f:
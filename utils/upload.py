@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 import argparse
+import concurrent.futures
 import json
 import logging
 import os
@@ -8,7 +9,7 @@ import tempfile
 import zipfile
 import re
 
-from typing import Any, Mapping, Set
+from typing import Any, List, Mapping, Set
 
 import omegaup.api
 import problems
@@ -23,6 +24,8 @@ CASES_DIR = 'cases'
 EXAMPLES_DIR = 'examples'
 INTERACTIVE_DIR = 'interactive'
 VALIDATOR_PREFIX = 'validator'
+CONTENT_DIRS = (STATEMENTS_DIR, SOLUTIONS_DIR, CASES_DIR, EXAMPLES_DIR,
+                INTERACTIVE_DIR)
 
 API_PROBLEM_DETAILS = '/api/problem/details/'
 API_PROBLEM_CREATE = '/api/problem/create/'
@@ -47,22 +50,28 @@ LANGUAGES_ALL = ','.join((
 LANGUAGES_KAREL = 'kj,kp'
 LANGUAGES_NONE = ''
 
+# A limit with no unit suffix, e.g. `1000` or `1.5`.
+NUMERIC_LIMIT_PATTERN = re.compile(r'^\d+(?:\.\d+)?$')
+
+# Number of concurrent admin / tag reconciliation calls per problem.
+_RECONCILE_WORKERS = 8
+
 
 def createProblemZip(problemConfig: Mapping[str, Any], problemPath: str,
                      zipPath: str) -> None:
     """Creates a problem .zip on the provided path."""
+    # Deflate level 1 is several times faster than the default level on large
+    # test cases while still compressing plain-text data well.
     with zipfile.ZipFile(zipPath, 'w',
-                         compression=zipfile.ZIP_DEFLATED) as archive:
+                         compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=1) as archive:
+        # Every file lives under problemPath, so its name inside the archive
+        # is just the rest of the path.
+        prefixLength = len(os.path.join(problemPath, ''))
 
         def _addFile(f: str) -> None:
             logging.debug('writing %s', f)
-            archive.write(f, os.path.relpath(f, problemPath))
-
-        def _recursiveAdd(directory: str) -> None:
-            for (root, _,
-                 filenames) in os.walk(os.path.join(problemPath, directory)):
-                for f in filenames:
-                    _addFile(os.path.join(root, f))
+            archive.write(f, f[prefixLength:])
 
         testplan = os.path.join(problemPath, TESTPLAN_FILE)
 
@@ -70,11 +79,15 @@ def createProblemZip(problemConfig: Mapping[str, Any], problemPath: str,
             _addFile(testplan)
 
         if problemConfig['Validator']['Name'] == 'custom':
-            validators = [
-                x
-                for x in os.listdir(problemPath)
-                if x.startswith(VALIDATOR_PREFIX)
-            ]
+            validators: List[str] = []
+            with os.scandir(problemPath) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(VALIDATOR_PREFIX):
+                        continue
+                    validators.append(entry.name)
+                    if len(validators) > 1:
+                        # Enough to know the configuration is invalid.
+                        break
 
             if not validators:
                 raise Exception('Custom validator missing!')
@@ -85,13 +98,14 @@ def createProblemZip(problemConfig: Mapping[str, Any], problemPath: str,
 
             _addFile(validator)
 
-        for directory in (STATEMENTS_DIR, SOLUTIONS_DIR, CASES_DIR):
-            _recursiveAdd(directory)
-
-        for directory in (EXAMPLES_DIR, INTERACTIVE_DIR):
-            if not os.path.isdir(os.path.join(problemPath, directory)):
-                continue
-            _recursiveAdd(directory)
+        # Each content directory is walked from its own path so that it is
+        # still included when it is a symlink. Missing directories yield
+        # nothing.
+        for directory in CONTENT_DIRS:
+            for (root, _, filenames) in os.walk(
+                    os.path.join(problemPath, directory)):
+                for f in filenames:
+                    _addFile(os.path.join(root, f))
 
 
 def uploadProblemZip(client: omegaup.api.Client,
@@ -146,10 +160,21 @@ def uploadProblemZip(client: omegaup.api.Client,
         if validator.get('validator') is None:
             payload['validator'] = validator.get('Name', 'default')
 
-    exists = client.query(
+    # A missing problem is an expected outcome here, so let the error
+    # response come back instead of having the client raise on it. Any other
+    # error (bad token, server error, ...) is still fatal.
+    response = client.query(
         API_PROBLEM_DETAILS,
-        {'problem_alias': alias}
-    )['status'] == 'ok'
+        {'problem_alias': alias},
+        check_=False
+    )
+    if response.get('status') == 'ok':
+        exists = True
+    elif (response.get('errorcode') == 404
+          or response.get('errorname') == 'problemNotFound'):
+        exists = False
+    else:
+        raise Exception(response)
 
     if not exists:
         if not canCreate:
@@ -220,70 +245,96 @@ def uploadProblemZip(client: omegaup.api.Client,
     if targetAdmins or targetAdminGroups:
         allAdmins = client.problem.admins(problem_alias=alias)
 
-    if targetAdmins and allAdmins:
-        admins = {
-            a['username'].lower()
-            for a in allAdmins['admins'] if a['role'] == 'admin'
-        }
-
-        desiredAdmins = {admin.lower() for admin in targetAdmins}
-
-        clientAdmin: Set[str] = set()
-        if client.username:
-            clientAdmin.add(client.username.lower())
-        adminsToRemove = admins - desiredAdmins - clientAdmin
-        adminsToAdd = desiredAdmins - admins - clientAdmin
-
-        for admin in adminsToAdd:
-            logging.info('Adding problem admin: %s', admin)
-            client.problem.addAdmin(problem_alias=alias, usernameOrEmail=admin)
-
-        for admin in adminsToRemove:
-            logging.info('Removing problem admin: %s', admin)
-            client.problem.removeAdmin(problem_alias=alias,
-                                       usernameOrEmail=admin)
-
-    if targetAdminGroups and allAdmins:
-        adminGroups = {
-            a['alias'].lower()
-            for a in allAdmins['group_admins'] if a['role'] == 'admin'
-        }
-
-        desiredGroups = {group.lower() for group in targetAdminGroups}
-
-        groupsToRemove = adminGroups - desiredGroups
-        groupsToAdd = desiredGroups - adminGroups
-
-        for group in groupsToAdd:
-            logging.info('Adding problem admin group: %s', group)
-            client.problem.addGroupAdmin(problem_alias=alias, group=group)
-
-        for group in groupsToRemove:
-            logging.info('Removing problem admin group: %s', group)
-            client.problem.removeGroupAdmin(problem_alias=alias, group=group)
-
-    if 'tags' in misc:
-        tags = {
-            t['name'].lower()
-            for t in client.problem.tags(problem_alias=alias)['tags']
-        }
-
-        desiredTags = {t.lower() for t in misc['tags']}
-
-        tagsToRemove = tags - desiredTags
-        tagsToAdd = desiredTags - tags
-
-        for tag in tagsToRemove:
-            if tag.startswith('problemRestrictedTag'):
-                logging.info('Skipping restricted tag: %s', tag)
-                continue
-            client.problem.removeTag(problem_alias=alias, name=tag)
-
-        for tag in tagsToAdd:
-            logging.info('Adding problem tag: %s', tag)
-            client.problem.addTag(problem_alias=alias,
-                                  name=tag,
-                                  public=payload.get('public', False))
+    # Each admin / group / tag change is an independent API call, so they are
+    # all issued concurrently instead of one round-trip at a time.
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=_RECONCILE_WORKERS) as executor:
+        futures: List[concurrent.futures.Future[Any]] = []
+
+        if targetAdmins and allAdmins:
+            admins = {
+                a['username'].lower()
+                for a in allAdmins['admins'] if a['role'] == 'admin'
+            }
+
+            desiredAdmins = {admin.lower() for admin in targetAdmins}
+
+            clientAdmin: Set[str] = set()
+            if client.username:
+                clientAdmin.add(client.username.lower())
+            adminsToRemove = admins - desiredAdmins - clientAdmin
+            adminsToAdd = desiredAdmins - admins - clientAdmin
+
+            for admin in adminsToAdd:
+                logging.info('Adding problem admin: %s', admin)
+                futures.append(
+                    executor.submit(client.problem.addAdmin,
+                                    problem_alias=alias,
+                                    usernameOrEmail=admin))
+
+            for admin in adminsToRemove:
+                logging.info('Removing problem admin: %s', admin)
+                futures.append(
+                    executor.submit(client.problem.removeAdmin,
+                                    problem_alias=alias,
+                                    usernameOrEmail=admin))
+
+        if targetAdminGroups and allAdmins:
+            adminGroups = {
+                a['alias'].lower()
+                for a in allAdmins['group_admins'] if a['role'] == 'admin'
+            }
+
+            desiredGroups = {group.lower() for group in targetAdminGroups}
+
+            groupsToRemove = adminGroups - desiredGroups
+            groupsToAdd = desiredGroups - adminGroups
+
+            for group in groupsToAdd:
+                logging.info('Adding problem admin group: %s', group)
+                futures.append(
+                    executor.submit(client.problem.addGroupAdmin,
+                                    problem_alias=alias,
+                                    group=group))
+
+            for group in groupsToRemove:
+                logging.info('Removing problem admin group: %s', group)
+                futures.append(
+                    executor.submit(client.problem.removeGroupAdmin,
+                                    problem_alias=alias,
+                                    group=group))
+
+        if 'tags' in misc:
+            tags = {
+                t['name'].lower()
+                for t in client.problem.tags(problem_alias=alias)['tags']
+            }
+
+            desiredTags = {t.lower() for t in misc['tags']}
+
+            tagsToRemove = tags - desiredTags
+            tagsToAdd = desiredTags - tags
+
+            for tag in tagsToRemove:
+                if tag.startswith('problemRestrictedTag'):
+                    logging.info('Skipping restricted tag: %s', tag)
+                    continue
+                futures.append(
+                    executor.submit(client.problem.removeTag,
+                                    problem_alias=alias,
+                                    name=tag))
+
+            for tag in tagsToAdd:
+                logging.info('Adding problem tag: %s', tag)
+                futures.append(
+                    executor.submit(client.problem.addTag,
+                                    problem_alias=alias,
+                                    name=tag,
+                                    public=payload.get('public', False)))
+
+        # Surface the first failure, just like the sequential calls did.
+        for future in futures:
+            future.result()
 
 
 def parse_limit_value(value):
@@ -297,7 +348,7 @@ def parse_limit_value(value):
             return int(float(value[:-2]))
         if value.endswith("s"):
             return int(float(value[:-1]) * 1000)
-        if re.match(r"^\d+(\.\d+)?$", value):
+        if NUMERIC_LIMIT_PATTERN.match(value):
             # Assume milliseconds if no suffix
             return int(float(value))
         raise ValueError(f"Invalid limit value format: {value}")
@@ -336,6 +387,36 @@ def uploadProblem(client: omegaup.api.Client, problemPath: str,
         logging.info('Success uploading %s', problemConfig['alias'])
 
 
+def _headCommit(rootDirectory: str) -> str:
+    """Returns the commit HEAD points to.
+
+    This reads the git metadata directly instead of spawning git, falling
+    back to `git rev-parse HEAD` for layouts it does not handle (e.g.
+    worktrees and submodules, where .git is a file).
+    """
+    gitDirectory = os.path.join(rootDirectory, '.git')
+    try:
+        with open(os.path.join(gitDirectory, 'HEAD'), 'r') as f:
+            head = f.read().strip()
+        if not head.startswith('ref: '):
+            return head
+        ref = head[len('ref: '):]
+        try:
+            with open(os.path.join(gitDirectory, ref), 'r') as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            with open(os.path.join(gitDirectory, 'packed-refs'), 'r') as f:
+                for line in f:
+                    sha, _, name = line.strip().partition(' ')
+                    if name == ref:
+                        return sha
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                   cwd=rootDirectory,
+                                   universal_newlines=True).strip()
+
+
 def _main() -> None:
     env = os.environ
 
@@ -386,13 +467,12 @@ def _main() -> None:
     client = omegaup.api.Client(api_token=args.api_token,
                                 url=args.url)
 
+    rootDirectory = problems.repositoryRoot()
+
     if env.get('GITHUB_ACTIONS'):
         commit = env['GITHUB_SHA']
     else:
-        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
-                                         universal_newlines=True).strip()
-
-    rootDirectory = problems.repositoryRoot()
+        commit = _headCommit(rootDirectory)
 
     for problem in problems.problems(allProblems=args.all,
                                      rootDirectory=rootDirectory,
@@ -6,6 +6,8 @@ Uses `problems.json` to locate problems and git diff to only check changed
 problems.
 """
 
+import concurrent.futures
+import functools
 import json
 import os
 import re
@@ -13,14 +15,34 @@ import sys
 import subprocess
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Set, Tuple
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 LOG = logging.getLogger(__name__)
 
+# Number of problems validated concurrently.
+MAX_WORKERS = 16
 
-def get_changed_files(repo_root: str) -> List[str]:
-    """Get list of changed files using git diff."""
+# Image references: ![alt text](image.png)
+IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\(([^)]+)\)')
+
+# Image references that are not local files: URLs, data URIs, fragments and
+# absolute paths.
+SKIPPED_IMAGE_PREFIXES = ('http://', 'https://', '/', '#', 'data:', 'mailto:')
+
+
+@functools.lru_cache(maxsize=8192)
+def _path_exists(path: str) -> bool:
+    """Cached os.path.exists, since problems often share paths."""
+    return os.path.exists(path)
+
+
+def get_changed_files(repo_root: str) -> Optional[List[str]]:
+    """Get list of changed files using git diff.
+
+    Returns None if the commit range cannot be diffed (e.g. it is not
+    available in a shallow clone).
+    """
     # Try to get commit range from environment variables
     env = os.environ
     commit_range = None
@@ -37,13 +59,23 @@ def get_changed_files(repo_root: str) -> List[str]:
 
     try:
         changes = subprocess.check_output(
-            ['git', 'diff', '--name-only', '--diff-filter=AMDR', commit_range],
-            cwd=repo_root,
-            universal_newlines=True)
-        return changes.splitlines()
+            ['git', 'diff', '--name-only', '--diff-filter=AMDR', '-z',
+             commit_range],
+            cwd=repo_root)
+        return [path for path in os.fsdecode(changes).split('\0') if path]
     except subprocess.CalledProcessError as e:
         LOG.error(f"Failed to get git diff: {e}")
-        return []
+        return None
+
+
+def get_changed_directories(changed_files: List[str]) -> Set[str]:
+    """Get every directory (and file) path touched by the changed files."""
+    changed_directories: Set[str] = set()
+    for changed_file in changed_files:
+        components = changed_file.split('/')
+        for i in range(1, len(components) + 1):
+            changed_directories.add('/'.join(components[:i]))
+    return changed_directories
 
 
 def load_problems_from_json(repo_root: str) -> List[dict]:
@@ -74,7 +106,7 @@ def validate_markdown_files(
     ]
 
     statement_exists = any(
-        os.path.exists(os.path.join(problem_path, f)) for f in statement_files)
+        _path_exists(os.path.join(problem_path, f)) for f in statement_files)
     if not statement_exists:
         errors.append(
             f"Problem '{problem_title}': Missing at least one statement file "
@@ -92,29 +124,56 @@ def validate_image_references(
     """Check if image references in Markdown files point to existing files."""
     errors = []
 
-    # Find all Markdown files
-    for root, dirs, files in os.walk(problem_path):
-        for file in files:
-            if file.endswith('.markdown') or file.endswith('.md'):
-                markdown_file = os.path.join(root, file)
-                errors.extend(_check_file_images(repo_root,
-                                                 markdown_file,
-                                                 problem_title))
+    # A single scan of the problem finds its Markdown files and every path
+    # that exists in it, so most image references need no extra stat.
+    problem_root = os.path.normpath(problem_path)
+    markdown_files: List[str] = []
+    existing_paths: Set[str] = set()
+    _scan_problem(problem_root, markdown_files, existing_paths)
+
+    for markdown_file in markdown_files:
+        errors.extend(_check_file_images(repo_root,
+                                         markdown_file,
+                                         problem_title,
+                                         existing_paths))
 
     return errors
 
 
+def _scan_problem(
+        path: str,
+        markdown_files: List[str],
+        existing_paths: Set[str]
+) -> None:
+    """Collect the Markdown files and all the paths under path.
+
+    Symlinks are left out of existing_paths, since they may be dangling or
+    point to directories that are not scanned.
+    """
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not entry.is_symlink():
+                existing_paths.add(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                _scan_problem(entry.path, markdown_files, existing_paths)
+            elif entry.name.endswith(('.markdown', '.md')):
+                markdown_files.append(entry.path)
+
+
 def _check_file_images(
         repo_root: str,
         markdown_file: str,
-        problem_title: str
+        problem_title: str,
+        existing_paths: Set[str]
 ) -> List[str]:
     """Check image references in a single Markdown file."""
     errors = []
 
+    with open(markdown_file, 'rb') as f:
+        raw = f.read()
+
     try:
-        with open(markdown_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = raw.decode('utf-8')
     except UnicodeDecodeError:
         errors.append(
             f"Problem '{problem_title}': Cannot read {markdown_file} "
@@ -122,15 +181,20 @@ def _check_file_images(
         )
         return errors
 
-    # Find image references: ![alt text](image.png)
-    image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    matches = re.findall(image_pattern, content)
+    # Most files have no images at all, so skip the pattern for those.
+    if b'![' not in raw:
+        return errors
+
+    # Image paths are already known to be relative, so they can be appended
+    # to the directory without going through os.path.join.
+    file_dir_prefix = os.path.dirname(markdown_file) + os.sep
+    relative_markdown_file = os.path.relpath(markdown_file, repo_root)
 
-    file_dir = os.path.dirname(markdown_file)
+    for match in IMAGE_PATTERN.finditer(content):
+        image_path = match.group(1)
 
-    for alt_text, image_path in matches:
         # Skip URLs and absolute paths
-        if image_path.startswith('http') or image_path.startswith('/'):
+        if image_path.startswith(SKIPPED_IMAGE_PREFIXES):
             continue
 
         # Handle relative paths
@@ -138,19 +202,47 @@ def _check_file_images(
             image_path = image_path[2:]
 
         # Resolve relative to markdown file
-        full_image_path = os.path.join(file_dir, image_path)
+        full_image_path = file_dir_prefix + image_path
 
-        if not os.path.exists(full_image_path):
+        # The scan only proves that a path exists; anything it does not
+        # contain (e.g. paths outside the problem or through symlinks) is
+        # checked on disk.
+        if (os.path.normpath(full_image_path) not in existing_paths
+                and not _path_exists(full_image_path)):
             errors.append(
                 f"Problem '{problem_title}': Image not found: {image_path} "
-                f"(in {os.path.relpath(markdown_file, repo_root)})"
+                f"(in {relative_markdown_file})"
             )
 
     return errors
 
 
+def validate_problem(
+        repo_root: str,
+        problem_path: str
+) -> Optional[Tuple[List[str], List[str]]]:
+    """Validate a single problem.
+
+    Returns its Markdown and image errors, or None if the problem path does
+    not exist.
+    """
+    full_problem_path = os.path.join(repo_root, problem_path)
+    problem_title = os.path.basename(problem_path)
+
+    if not _path_exists(full_problem_path):
+        return None
+
+    markdown_errors = validate_markdown_files(full_problem_path,
+                                              problem_title)
+    image_errors = validate_image_references(repo_root,
+                                             full_problem_path,
+                                             problem_title)
+    return markdown_errors, image_errors
+
+
 def main():
     """Main validation function."""
+    _path_exists.cache_clear()
     try:
         # Get repository root (assuming script is in utils/ directory)
         repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -158,7 +250,14 @@ def main():
 
         # Get changed files
         changed_files = get_changed_files(repo_root)
-        LOG.info(f"\nFound {len(changed_files)} changed files in git diff")
+        if changed_files is None:
+            # Validating nothing would let every change pass unchecked.
+            LOG.warning("⚠️  Could not diff, validating all problems")
+            changed_directories = None
+        else:
+            LOG.info(
+                f"\nFound {len(changed_files)} changed files in git diff")
+            changed_directories = get_changed_directories(changed_files)
 
         # Load problems from problems.json
         problems = load_problems_from_json(repo_root)
@@ -173,41 +272,51 @@ def main():
 
         LOG.info("\n🔍 Validating changed problems...")
 
-        # Validate each problem if it has changes
+        # Only problems with changes are validated
+        changed_problems = []
         for problem in problems:
             problem_path = problem["path"]
-            full_problem_path = os.path.join(repo_root, problem_path)
             problem_title = os.path.basename(problem_path)
 
             # Check if this problem has any changes
-            if not any(f.startswith(problem_path) for f in changed_files):
-                LOG.info(f"\n⏩ Skipping problem: {problem_title} (no changes)")
+            if (changed_directories is not None and
+                    problem_path.rstrip('/') not in changed_directories):
+                LOG.debug("⏩ Skipping problem: %s (no changes)",
+                          problem_title)
                 continue
 
+            changed_problems.append(problem_path)
+
+        # The checks are dominated by filesystem I/O, so the problems are
+        # validated concurrently and reported in order afterwards.
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=MAX_WORKERS) as executor:
+            results = list(executor.map(
+                functools.partial(validate_problem, repo_root),
+                changed_problems))
+
+        for problem_path, result in zip(changed_problems, results):
+            full_problem_path = os.path.join(repo_root, problem_path)
+            problem_title = os.path.basename(problem_path)
+
             checked_problems += 1
             LOG.info(f"\n📝 Checking problem: {problem_title}")
             LOG.info(f"   Path: {problem_path}")
             LOG.info(f"   Full path: {full_problem_path}")
 
-            if not os.path.exists(full_problem_path):
+            if result is None:
                 error_msg = f"Problem path does not exist: {full_problem_path}"
                 LOG.error(f"   ❌ {error_msg}")
                 all_errors.append(error_msg)
                 continue
 
-            # Check Markdown files
-            markdown_errors = validate_markdown_files(full_problem_path,
-                                                      problem_title)
+            markdown_errors, image_errors = result
             if markdown_errors:
                 LOG.info("   Missing files:")
                 for error in markdown_errors:
                     LOG.error(f"      ❌ {error}")
             all_errors.extend(markdown_errors)
 
-            # Check image references
-            image_errors = validate_image_references(repo_root,
-                                                     full_problem_path,
-                                                     problem_title)
             if image_errors:
                 LOG.info("   Image issues:")
                 for error in image_errors: